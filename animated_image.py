@@ -25,10 +25,13 @@ If present, this frame is to be skipped during the animation loop.
 This is useful mainly for non-infinite-loop animations,
 like emulating a button's click with an image.
 """
+from concurrent.futures import Future
 from pathlib import Path
+import sys
 import time
 import PySimpleGUI as sg
 from PIL import Image, ImageSequence, ImageTk
+from frame_decoder import FrameDecoder
 
 
 def millis() -> int:
@@ -37,11 +40,12 @@ def millis() -> int:
 
 
 class AnimatedImage:
-    def __init__(self, image: sg.Image, filename: Path | str = None, stats=False):
+    def __init__(self, image: sg.Image, filename: Path | str = None, stats=False, decoder: FrameDecoder = None):
         """
         Initialization:
         :param image: PSG.Image to be animated (must have finalized the Window beforehand)
         :param filename: path to .png file (can be loaded later)
+        :param decoder: decode frames in worker processes rather than here
         """
         self.pic = image
         self.save_image = self.pic.Widget.image         # noqa # save existing image
@@ -58,6 +62,9 @@ class AnimatedImage:
         self.fps_cnt = 0
         self.name = ''
         self.stats = stats
+        self.decoder = decoder
+        self.pending: Future | None = None          # frames being decoded by a worker
+        self.frame_step = 1         # >1 ==> skip frames (lower fps) at the same overall speed
 
         if filename:
             self.load(filename)     # load the image file
@@ -77,13 +84,19 @@ class AnimatedImage:
         if not filename.exists():
             raise FileNotFoundError('AnimatedImage file not found:', filename)
 
+        if self.pending:                # changed our mind
+            self.decoder.release(self.pending)
+            self.pending = None
         self.frames.clear()
         self.durations.clear()
-        with Image.open(filename) as img:
-            self.loop = img.info.get('loop', 0)
-            for frame in ImageSequence.Iterator(img):
-                self.frames.append(ImageTk.PhotoImage(frame))
-                self.durations.append(int(frame.info.get('duration', 0)))
+        if self.decoder:                # let a worker do the heavy lifting (see _collect())
+            self.pending = self.decoder.submit(filename)
+        else:
+            with Image.open(filename) as img:
+                self.loop = img.info.get('loop', 0)
+                for frame in ImageSequence.Iterator(img):
+                    self.frames.append(ImageTk.PhotoImage(frame))
+                    self.durations.append(int(frame.info.get('duration', 0)))
 
         self.frame_cnt = len(self.frames)
         self.has_default = self.frame_cnt > 1 and self.durations[0] == 0
@@ -92,33 +105,79 @@ class AnimatedImage:
         return self
 
     def start(self) -> 'AnimatedImage':
-        """Display the first frame of our sequence"""
-        self.curr_frame = 1 if self.has_default else 0      # skip "default image"
+        """Display the first frame of our sequence (or as soon as it has been decoded)"""
         self.curr_loop = 0
-        self.pic.update(data=self.frames[self.curr_frame])
         self.running = True
         self.fps_cnt = 0
         self.timer = self.fps_timer = millis()
+        if self._collect():
+            if self.frames:
+                self._first_frame()
+            else:
+                self.running = False        # nothing to show (decoding failed)
         return self     # enables: var = AnimatedImage(...).start()
 
+    def _first_frame(self):
+        self.curr_frame = 1 if self.has_default else 0      # skip "default image"
+        self.pic.update(data=self.frames[self.curr_frame])
+        self.timer = self.fps_timer = millis()
+
+    def _collect(self) -> bool:
+        """Build our frames once a worker has finished decoding them: False if still waiting (or failed)"""
+        if self.pending:
+            if not self.pending.done():
+                return False
+            future, self.pending = self.pending, None
+            try:
+                decoded = self.decoder.collect(future)
+                frames = decoded.photo_images()
+            except Exception as exc:        # bad file, worker died, ...
+                print(f'AnimatedImage "{self.name}" decoding failed: {exc!r}', file=sys.stderr)
+                self.name = ''              # let a later load() try again
+                if self.running:
+                    self.pic.update(data=self.save_image)
+                    self.running = False
+                return False
+            self.loop = decoded.loop
+            self.frames += frames
+            self.durations += decoded.durations
+            self.frame_cnt = len(self.frames)
+            self.has_default = self.frame_cnt > 1 and self.durations[0] == 0
+        return True
+
     def run(self):
         """Call this during Window event loop to cause animation to occur"""
-        if self.running and self.frame_cnt > 1:
+        if self.running and self.pending:
+            if self._collect():     # frames are ready: now we can really start
+                self._first_frame()
+        elif self.running and self.frame_cnt > 1:
             now = millis()
-            if (now - self.timer) < self.durations[self.curr_frame]:
+            if (now - self.timer) < self._step_duration():
                 return      # display no cine before it's time
-            self.curr_frame += 1
-            if self.curr_frame >= self.frame_cnt:       # reached end of loop
-                if self.loop:                           # finite loop count?
-                    self.curr_loop += 1
-                    if self.curr_loop >= self.loop:     # reached loop max?
-                        self.stop()
-                        return
-                self.curr_frame = 1 if self.has_default else 0      # skip "default image"
+            for _ in range(self.frame_step):
+                self.curr_frame += 1
+                if self.curr_frame >= self.frame_cnt:       # reached end of loop
+                    if self.loop:                           # finite loop count?
+                        self.curr_loop += 1
+                        if self.curr_loop >= self.loop:     # reached loop max?
+                            self.stop()
+                            return
+                    self.curr_frame = 1 if self.has_default else 0      # skip "default image"
             self.pic.update(data=self.frames[self.curr_frame])
             self.timer = now
             self.fps_cnt += 1
 
+    def _step_duration(self) -> int:
+        """Total duration of the frames covered by one frame_step (wrapping around the loop)"""
+        duration = 0
+        frame = self.curr_frame
+        for _ in range(self.frame_step):
+            duration += self.durations[frame]
+            frame += 1
+            if frame >= self.frame_cnt:
+                frame = 1 if self.has_default else 0
+        return duration
+
     def stop(self):
         """Stop animation and revert to original image"""
         if self.running:
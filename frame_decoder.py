@@ -0,0 +1,164 @@
+"""
+Decode animated .png files in worker processes instead of the GUI process.
+
+Decoding an APNG with PIL holds the GIL for long enough to cause visible hitches
+in the animations already running. Here, a process pool does the decoding:
+each worker writes every frame as raw RGBA into a single shared memory block,
+and the GUI process builds the tkinter images straight from that block. (PIL
+and Tk each still copy a frame once on the way in, but no decoding happens here.)
+
+Decoding is asynchronous: submit() returns a Future that the caller polls from
+its event loop, and only once it is done() does collect() build the images.
+Files can also be prefetched so the work spreads across cores ahead of time,
+e.g. the button animations at startup or the effects needed next. Prefetched
+results hold their shared memory until collected, so stale ones should be
+discarded, and only a few are kept at once. Pinned prefetches (e.g. the close
+effect) are never evicted, and are decoded again after being collected.
+
+Since the workers hand their shared memory over to us, any not collected are
+released by shutdown(), which also runs at exit however the program ends.
+"""
+import atexit
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from PIL import Image, ImageSequence, ImageTk
+
+
+@dataclass
+class DecodedFrames:
+    """Frames of one animation, waiting in shared memory"""
+    name: str = ''
+    shm_name: str = ''
+    size: tuple[int, int] = (0, 0)
+    loop: int = 0
+    durations: list[int] = field(default_factory=list)
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.size[0] * self.size[1] * 4
+
+    def photo_images(self) -> list[ImageTk.PhotoImage]:
+        """Build the tkinter images from shared memory (PIL and Tk copy each frame in), then release it"""
+        shm = SharedMemory(self.shm_name)
+        try:
+            frames = []
+            for idx in range(len(self.durations)):
+                with shm.buf[idx * self.frame_bytes:(idx + 1) * self.frame_bytes] as view:
+                    img = Image.frombuffer('RGBA', self.size, view, 'raw', 'RGBA', 0, 1)
+                    frames.append(ImageTk.PhotoImage(img))
+                    del img         # release our hold on the buffer
+            return frames
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def discard(self):
+        """Release the shared memory without using it"""
+        shm = SharedMemory(self.shm_name)
+        shm.close()
+        shm.unlink()
+
+
+def _decode(filename: str) -> DecodedFrames:
+    """(Worker process) decode all frames into a new shared memory block"""
+    with Image.open(filename) as img:
+        decoded = DecodedFrames(Path(filename).stem, '', img.size, img.info.get('loop', 0))
+        frame_cnt = getattr(img, 'n_frames', 1)
+        shm = SharedMemory(create=True, size=frame_cnt * decoded.frame_bytes)
+        decoded.shm_name = shm.name
+        try:
+            for idx, frame in enumerate(ImageSequence.Iterator(img)):
+                rgba = frame.convert('RGBA')
+                if rgba.size != decoded.size:
+                    rgba = rgba.resize(decoded.size)
+                start = idx * decoded.frame_bytes
+                shm.buf[start:start + decoded.frame_bytes] = rgba.tobytes()
+                decoded.durations.append(int(frame.info.get('duration', 0)))
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        shm.close()
+        # The GUI process owns (and will unlink) the block: don't let this worker's tracker remove it
+        resource_tracker.unregister(shm._name, 'shared_memory')     # noqa
+    return decoded
+
+
+class FrameDecoder:
+    """Process pool that decodes animations into shared memory"""
+    def __init__(self, workers: int | None = None, max_pending: int = 8):
+        """
+        Initialization:
+        :param workers: number of worker processes (default: one per core)
+        :param max_pending: unpinned prefetches kept before the oldest is discarded
+        """
+        self._pool = ProcessPoolExecutor(workers)
+        self._pending: dict[Path, Future] = {}      # prefetched, not yet asked for
+        self._pinned: set[Path] = set()
+        self._outstanding: set[Future] = set()      # handed out, not yet collected
+        self.max_pending = max_pending
+        atexit.register(self.shutdown)              # don't leave blocks behind in /dev/shm
+
+    def prefetch(self, *filenames: Path | str, pinned=False):
+        """Start decoding files we expect to load soon (pinned: keep until shutdown)"""
+        for filename in filenames:
+            filename = Path(filename)
+            if pinned:
+                self._pinned.add(filename)
+            if filename not in self._pending:
+                self._pending[filename] = self._pool.submit(_decode, str(filename))
+        unpinned = [fn for fn in self._pending if fn not in self._pinned]
+        for filename in unpinned[:max(0, len(unpinned) - self.max_pending)]:     # oldest first
+            self._release(self._pending.pop(filename))
+
+    def discard(self, *filenames: Path | str):
+        """Drop (unpinned) prefetches that are no longer wanted"""
+        for filename in filenames:
+            filename = Path(filename)
+            if filename in self._pending and filename not in self._pinned:
+                self._release(self._pending.pop(filename))
+
+    def submit(self, filename: Path | str) -> Future:
+        """Get a Future for a file's frames (prefetched, or started now); poll it with done()"""
+        filename = Path(filename)
+        future = self._pending.pop(filename, None) or self._pool.submit(_decode, str(filename))
+        if filename in self._pinned:
+            self._pending[filename] = self._pool.submit(_decode, str(filename))     # keep one ready
+        self._outstanding.add(future)
+        return future
+
+    def collect(self, future: Future) -> DecodedFrames:
+        """Take the result of a done() Future from submit()"""
+        self._outstanding.discard(future)
+        return future.result()
+
+    def release(self, future: Future):
+        """Give back a Future from submit() that is no longer wanted"""
+        self._outstanding.discard(future)
+        self._release(future)
+
+    def shutdown(self):
+        """Stop the workers and release any uncollected frames (safe to call again)"""
+        atexit.unregister(self.shutdown)
+        for future in list(self._pending.values()) + list(self._outstanding):
+            self._release(future)
+        self._pending.clear()
+        self._outstanding.clear()
+        self._pool.shutdown()
+
+    @staticmethod
+    def _release(future: Future):
+        """Free a result's shared memory without waiting for it to finish decoding"""
+        if not future.cancel():
+            future.add_done_callback(_discard_result)
+
+
+def _discard_result(future: Future):
+    """(Done callback) release the shared memory of an unwanted result"""
+    try:
+        future.result().discard()
+    except Exception:       # nothing was left in shared memory
+        pass
@@ -0,0 +1,410 @@
+"""
+Reduce the TARDIS animations to per-LED colour sequences for the Arduino model.
+
+The GUI shows each effect as a full-colour APNG, but the real model only has a
+handful of LEDs: one behind each window pane plus the beacon on top. This module
+samples each animation at those LED positions and produces:
+
+    A compact binary encoding for use in firmware:
+        palette indexing (each LED colour becomes a 1-byte palette index, with
+            near-identical sampled colours merged)
+        delta coding (a frame stores only the LEDs that changed since the previous one)
+        run-length encoding of unchanged LEDs (as a bitmask: 1 bit per LED)
+
+    A streaming mode that pushes the raw LED colours over a serial port at the
+    authored frame timing, so the model can be driven live from this app.
+
+Encoded layout (all multi-byte values little-endian):
+    'TLED'  magic
+    u8      format version
+    u8      LED count
+    u16     frame count
+    u16     loop count (0 ==> infinite)
+    u8      palette size (0 ==> 256)
+    rgb[]   palette (3 bytes per entry)
+    then per frame:
+        u16     duration in msecs; the top bit (MASKED) selects the frame's coding:
+        either (clear):
+            u8[]    palette index of every LED
+        or (set):
+            u8[]    changed-LED bitmask, (LED count + 7) // 8 bytes, LED 0 in bit 0 of byte 0
+            u8[]    new palette index of each changed LED
+        whichever is smaller, so a frame never costs more than plain palette indexing.
+
+The animations are kept separate, just like VideoPlayer does: windows (box) and
+beacon run on their own timing, and the beacon files are shared between effects.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+import os
+import struct
+import sys
+import time
+from PIL import Image, ImageSequence
+
+# LED sample points in the 318x517 box images: 2 rows of 3 panes per door
+WINDOW_LEDS: list[tuple[int, int]] = [
+    (x, y) for y in (111, 153) for x in (64, 94, 122, 193, 222, 251)
+]
+# ... and in the 318x53 beacon images
+BEACON_LEDS: list[tuple[int, int]] = [(158, 28)]
+
+SAMPLE_RADIUS = 3       # average a small square around each LED point
+MAX_PALETTE = 256       # palette indices must fit in a byte
+COLOR_TOLERANCE = 12    # sampled colours within this (per channel) share a palette entry
+
+MAGIC = b'TLED'
+VERSION = 2
+HEADER = '<BBHHB'       # (after MAGIC) version, LED count, frame count, loop, palette size
+MASKED = 0x8000         # frame duration flag: only changed LEDs follow
+STREAM_SYNC = 0xA5      # first byte of each streamed frame
+
+
+@dataclass
+class LedSequence:
+    """Per-LED colours for each frame of an animation"""
+    name: str = ''
+    loop: int = 0                                                   # 0 ==> infinite
+    durations: list[int] = field(default_factory=list)              # msecs per frame
+    frames: list[list[tuple[int, int, int]]] = field(default_factory=list)     # RGB per LED
+
+    @property
+    def led_cnt(self) -> int:
+        return len(self.frames[0]) if self.frames else 0
+
+    def __str__(self) -> str:
+        return f'"{self.name}": {len(self.frames)} frames x {self.led_cnt} LEDs, loop={self.loop}'
+
+
+def sample_leds(filename: Path | str, positions: list[tuple[int, int]]) -> LedSequence:
+    """Sample an animated .png at the given LED positions"""
+    if isinstance(filename, str):
+        filename = Path(filename)
+    if not filename.exists():
+        raise FileNotFoundError('LED export file not found:', filename)
+
+    seq = LedSequence(filename.stem)
+    r = SAMPLE_RADIUS
+    with Image.open(filename) as img:
+        seq.loop = img.info.get('loop', 0)
+        for frame in ImageSequence.Iterator(img):
+            rgb = frame.convert('RGB')
+            seq.frames.append([rgb.crop((x - r, y - r, x + r + 1, y + r + 1)).resize((1, 1), Image.BOX).getpixel((0, 0))
+                               for x, y in positions])
+            seq.durations.append(int(frame.info.get('duration', 0)))
+
+    # Skip the APNG "default image" (see AnimatedImage): the LEDs are simply off when not animating
+    if len(seq.frames) > 1 and seq.durations[0] == 0:
+        del seq.frames[0]
+        del seq.durations[0]
+    return seq
+
+
+def make_palette(seq: LedSequence) -> tuple[list[tuple[int, int, int]], list[list[int]]]:
+    """Map each LED colour to a palette index, merging near-identical colours (and quantizing if still too many)"""
+    counts: dict[tuple[int, int, int], int] = {}
+    for frame in seq.frames:
+        for c in frame:
+            counts[c] = counts.get(c, 0) + 1
+    colors: list[tuple[int, int, int]] = []
+    lookup = {}
+    for c in sorted(counts, key=counts.get, reverse=True):     # most used colours become the palette
+        for idx, pc in enumerate(colors):
+            if max(abs(a - b) for a, b in zip(c, pc)) <= COLOR_TOLERANCE:
+                lookup[c] = idx
+                break
+        else:
+            lookup[c] = len(colors)
+            colors.append(c)
+    if len(colors) <= MAX_PALETTE:
+        return colors, [[lookup[c] for c in frame] for frame in seq.frames]
+
+    # Too many: let PIL pick the palette (1 pixel per LED, 1 row per frame)
+    img = Image.new('RGB', (seq.led_cnt, len(seq.frames)))
+    img.putdata([c for frame in seq.frames for c in frame])
+    quant = img.quantize(MAX_PALETTE)
+    pal = quant.getpalette()[:3 * MAX_PALETTE]
+    palette = [tuple(pal[i:i + 3]) for i in range(0, len(pal), 3)]
+    data = list(quant.getdata())
+    w = seq.led_cnt
+    return palette, [data[i:i + w] for i in range(0, len(data), w)]
+
+
+def encode_frame(frame: list[int], prev: list[int]) -> tuple[bool, bytes]:
+    """Code one frame of palette indices: (masked?, data)"""
+    mask = bytearray((len(frame) + 7) // 8)
+    changed = bytearray()
+    for idx, (curr, last) in enumerate(zip(frame, prev)):
+        if curr != last:
+            mask[idx >> 3] |= 1 << (idx & 7)
+            changed.append(curr)
+    if len(mask) + len(changed) < len(frame):
+        return True, bytes(mask + changed)
+    return False, bytes(frame)
+
+
+def encode(seq: LedSequence) -> bytes:
+    """Encode an LED sequence in the compact firmware format (see module doc)"""
+    palette, indexed = make_palette(seq)
+    out = bytearray(MAGIC)
+    out += struct.pack(HEADER, VERSION, seq.led_cnt, len(indexed), seq.loop, len(palette) % MAX_PALETTE)
+    for color in palette:
+        out += bytes(color)
+
+    prev = [0] * seq.led_cnt        # firmware starts with all LEDs at palette[0]
+    for duration, frame in zip(seq.durations, indexed):
+        masked, data = encode_frame(frame, prev)
+        out += struct.pack('<H', min(duration, MASKED - 1) | (MASKED if masked else 0))
+        out += data
+        prev = frame
+    return bytes(out)
+
+
+def palette_only_size(seq: LedSequence) -> int:
+    """Size if every frame were plain palette indices (what encode() must beat)"""
+    palette, _ = make_palette(seq)
+    return len(MAGIC) + struct.calcsize(HEADER) + 3 * len(palette) + len(seq.frames) * (2 + seq.led_cnt)
+
+
+def decode(data: bytes, name: str = '') -> LedSequence:
+    """Decode the compact format back into an LED sequence (as the firmware would)"""
+    if data[:4] != MAGIC:
+        raise ValueError(f'Not an LED sequence: {name}')
+    version, led_cnt, frame_cnt, loop, pal_cnt = struct.unpack_from(HEADER, data, 4)
+    if version != VERSION:
+        raise ValueError(f'Unsupported LED sequence version {version}: {name}')
+    pos = 4 + struct.calcsize(HEADER)
+    pal_cnt = pal_cnt or MAX_PALETTE
+    palette = [tuple(data[i:i + 3]) for i in range(pos, pos + 3 * pal_cnt, 3)]
+    pos += 3 * pal_cnt
+
+    seq = LedSequence(name, loop)
+    curr = [0] * led_cnt
+    mask_len = (led_cnt + 7) // 8
+    for _ in range(frame_cnt):
+        duration, = struct.unpack_from('<H', data, pos)
+        pos += 2
+        if duration & MASKED:
+            mask = data[pos:pos + mask_len]
+            pos += mask_len
+            for idx in range(led_cnt):
+                if mask[idx >> 3] & (1 << (idx & 7)):
+                    curr[idx] = data[pos]
+                    pos += 1
+        else:
+            curr = list(data[pos:pos + led_cnt])
+            pos += led_cnt
+        seq.durations.append(duration & ~MASKED)
+        seq.frames.append([palette[i] for i in curr])
+    return seq
+
+
+def to_c_array(name: str, data: bytes) -> str:
+    """Format encoded data as a C array for inclusion in Arduino code"""
+    lines = [f'// {len(data)} bytes', f'const uint8_t {name}[] PROGMEM = {{']
+    for idx in range(0, len(data), 16):
+        lines.append('  ' + ', '.join(f'0x{b:02X}' for b in data[idx:idx + 16]) + ',')
+    lines.append('};')
+    return '\n'.join(lines)
+
+
+def export_effects(images_folder: Path, out_file: Path | None = None) -> str:
+    """Export every effect's window and beacon animations as a C header"""
+    from video_player import effects, BeaconSpeed    # (pulls in PySimpleGUI)
+
+    parts = ['// Generated by led_export.py - do not edit', '#pragma once', '']
+    for speed in BeaconSpeed:           # beacons are shared by many effects
+        seq = sample_leds(images_folder / (speed.value + '.png'), BEACON_LEDS)
+        data = encode(seq)
+        print(f'{seq} -> {len(data)} bytes')
+        parts += [to_c_array(speed.value, data), '']
+
+    done = set()
+    for effect_name, (box_file, beacon_speed) in effects.items():
+        parts.append(f'// {effect_name}: {box_file} + {beacon_speed.value}')
+        if box_file not in done:
+            seq = sample_leds(images_folder / (box_file + '.png'), WINDOW_LEDS)
+            data = encode(seq)
+            print(f'{seq} -> {len(data)} bytes')
+            parts += [to_c_array(box_file, data), '']
+            done.add(box_file)
+
+    header = '\n'.join(parts)
+    if out_file:
+        out_file.write_text(header)
+    return header
+
+
+@dataclass
+class _StreamPos:
+    """Where a sequence being streamed is up to"""
+    seq: LedSequence
+    loops: int              # 0 ==> forever
+    frame: int = 0
+    offset: int = 0         # authored time of the current frame (msecs)
+    curr_loop: int = 0
+
+    def advance(self) -> bool:
+        """Step to the next frame; False once all loops are done"""
+        self.offset += self.seq.durations[self.frame]
+        self.frame += 1
+        if self.frame >= len(self.seq.frames):
+            self.frame = 0
+            self.curr_loop += 1
+        return not self.loops or self.curr_loop < self.loops
+
+
+class LedStreamer:
+    """
+    Push LED frames to a serial port (or anything with write()) at the authored timing.
+
+    Each frame is sent as: STREAM_SYNC, LED count, then RGB bytes for each LED.
+    Several sequences (e.g. windows and beacon) can be streamed together, each on
+    its own timing; the LED count tells the receiver which one a packet is for.
+
+    Frame deadlines are computed from the start time rather than from the previous
+    frame, so lateness never accumulates: each frame is sent within max_jitter msecs
+    of its authored time, or skipped (and counted) if we have already fallen behind.
+    """
+    def __init__(self, port, max_jitter: int = 5, stats=False):
+        """
+        Initialization:
+        :param port: open serial.Serial (or binary file/pty) to write to
+        :param max_jitter: msecs a frame may be late before it is dropped
+        """
+        self.port = port
+        self.max_jitter = max_jitter
+        self.stats = stats
+        # for the latest stream() call:
+        self.sent = 0
+        self.skipped = 0
+        self.worst = 0          # latest frame sent (msecs)
+
+    @staticmethod
+    def packet(frame: list[tuple[int, int, int]]) -> bytes:
+        """Build the wire format for a single frame"""
+        return bytes([STREAM_SYNC, len(frame)] + [v for rgb in frame for v in rgb])
+
+    def stream(self, *seqs: LedSequence, loops: int | None = None):
+        """
+        Send the sequence(s), honouring their frame durations
+        :param loops: number of passes (default: each sequence's own loop count, 0 ==> forever)
+
+        A static sequence (all durations 0, like a single still image) is sent just once.
+        """
+        active = [_StreamPos(seq, 1 if not sum(seq.durations) else seq.loop if loops is None else loops)
+                  for seq in seqs if seq.frames]
+        self.sent = self.skipped = self.worst = 0
+        start = time.perf_counter()
+        while active:
+            pos = min(active, key=lambda p: p.offset)       # whichever is due first
+            deadline = start + pos.offset / 1000
+            frame = pos.seq.frames[pos.frame]
+            if not pos.advance():
+                active.remove(pos)
+            late = (time.perf_counter() - deadline) * 1000
+            if late > self.max_jitter:
+                self.skipped += 1       # catch up rather than drift
+                continue
+            self._wait_until(deadline)
+            self.port.write(self.packet(frame))
+            self.port.flush()
+            self.worst = max(self.worst, (time.perf_counter() - deadline) * 1000)
+            self.sent += 1
+
+        if self.stats:
+            names = ' + '.join(seq.name for seq in seqs)
+            print(f'{names}: {self.sent} frames sent, {self.skipped} skipped, '
+                  f'worst jitter {self.worst:.2f} msecs')
+
+    @staticmethod
+    def _wait_until(deadline: float):
+        """Sleep most of the way, then spin for the last msec (sleep() alone is too coarse)"""
+        while (remaining := deadline - time.perf_counter()) > 0:
+            if remaining > .002:
+                time.sleep(remaining - .001)
+
+
+def open_port(device: str, baud: int = 115200):
+    """Open a serial port to the model (requires pyserial)"""
+    import serial
+    return serial.Serial(device, baud, write_timeout=1)
+
+
+if __name__ == '__main__':
+    # Usage:
+    #   led_export.py [header.h]            export all effects (default: tardis_leds.h)
+    #   led_export.py -s DEVICE EFFECT      stream an effect's window and beacon LEDs to a serial port
+    #   led_export.py -t                    stream through a local pty and check what arrives
+    def test():
+        """Round-trip the encoder and time a stream through a pseudo-terminal"""
+        import threading
+        import tty
+        images = Path(__file__).parent / 'images'
+        seq = sample_leds(images / 'flicker.png', WINDOW_LEDS)
+        beacon = sample_leds(images / 'beacon_fast.png', BEACON_LEDS)
+        data = encode(seq)
+        palette, indexed = make_palette(seq)
+        assert decode(data).frames == [[palette[i] for i in f] for f in indexed]
+        assert decode(data).durations == seq.durations
+        plain = palette_only_size(seq)
+        print(f'{seq}: {len(data)} bytes encoded vs {plain} palette-only')
+        assert len(data) < plain
+
+        master, slave = os.openpty()
+        tty.setraw(slave)           # no newline translation, please
+        received = bytearray()
+
+        def reader():
+            """Drain the pty while we stream (its buffer is only a few KB)"""
+            try:
+                while chunk := os.read(master, 4096):
+                    received.extend(chunk)
+            except OSError:         # slave closed
+                pass
+
+        read_thread = threading.Thread(target=reader)
+        read_thread.start()
+        with os.fdopen(slave, 'wb', buffering=0) as port:
+            streamer = LedStreamer(port, stats=True)
+            streamer.stream(seq, beacon, loops=3)
+            sent = streamer.sent
+            # a still image must be sent once, not forever
+            streamer.stream(sample_leds(images / 'box_angel.png', WINDOW_LEDS), loops=0)
+            assert streamer.sent == 1
+            sent += streamer.sent
+        read_thread.join()
+        os.close(master)
+
+        counts = {seq.led_cnt: 0, beacon.led_cnt: 0}
+        pos = 0
+        while pos < len(received):
+            assert received[pos] == STREAM_SYNC
+            counts[received[pos + 1]] += 1
+            pos += 2 + 3 * received[pos + 1]
+        assert sum(counts.values()) == sent
+        print(f'pty received {counts[seq.led_cnt]} window + {counts[beacon.led_cnt]} beacon frames')
+
+    if '-t' in sys.argv:
+        test()
+    elif '-s' in sys.argv:
+        stream_args = sys.argv[sys.argv.index('-s') + 1:]
+        if len(stream_args) < 2:
+            print('Usage: led_export.py -s DEVICE EFFECT', file=sys.stderr)
+            sys.exit(1)
+        from video_player import effects
+        if stream_args[1] not in effects:
+            print('Usage: led_export.py -s DEVICE EFFECT', file=sys.stderr)
+            print('  EFFECT is one of:', ', '.join(effects), file=sys.stderr)
+            sys.exit(1)
+        device, effect = stream_args[:2]
+        box_file, beacon_speed = effects[effect]
+        images = Path(__file__).parent / 'images'
+        box_seq = sample_leds(images / (box_file + '.png'), WINDOW_LEDS)
+        beacon_seq = sample_leds(images / (beacon_speed.value + '.png'), BEACON_LEDS)
+        with open_port(device) as serial_port:
+            LedStreamer(serial_port, stats=True).stream(box_seq, beacon_seq, loops=0)
+    else:
+        header_file = Path(sys.argv[1] if len(sys.argv) > 1 else 'tardis_leds.h')
+        export_effects(Path(__file__).parent / 'images', header_file)
+        print(f'Wrote {header_file}')
@@ -0,0 +1,152 @@
+"""
+Watch the GUI event loop for tick overruns and degrade the display in stages.
+
+The event loop expects a TIMEOUT event every `window.read(10)` msecs. When the
+machine is busy, those ticks arrive late and every animation simply slows down.
+Instead, this monitor counts late ticks over a sliding window and steps through:
+
+    FULL        everything animates normally
+    SHED_DECOR  button animations and progress bar updates are dropped
+    SKIP_HALF   the TARDIS box animation shows every 2nd frame
+    SKIP_THIRD  ... every 3rd frame
+
+Audio and the beacon animation are never degraded. Stages are stepped back
+down automatically once the overruns subside. A stage must be held for a
+while before changing again so that we don't flip-flop on a single hiccup.
+"""
+from collections import deque
+import time
+
+
+class LoadMonitor:
+    """Event loop tick overrun detector with staged degradation"""
+    FULL, SHED_DECOR, SKIP_HALF, SKIP_THIRD = range(4)
+    STAGE_NAMES = ('full quality', 'shed decorations', 'box at 1/2 fps', 'box at 1/3 fps')
+    FRAME_STEPS = (1, 1, 2, 3)          # box animation frame step for each stage
+
+    def __init__(self, tick_ms: int = 10, enabled=True, log=print,
+                 window: int = 50, degrade_pct: int = 30, recover_pct: int = 5, hold_ticks: int = 100):
+        """
+        Initialization:
+        :param tick_ms: expected event loop timeout (as passed to window.read())
+        :param enabled: when False, tick() always reports FULL
+        :param log: where degradation messages go (print, eprint, ...)
+        :param window: number of recent ticks examined
+        :param degrade_pct: % of late ticks in window that steps quality down
+        :param recover_pct: % of late ticks in window that steps quality back up
+        :param hold_ticks: minimum ticks between stage changes
+        """
+        self.tick_ms = tick_ms
+        self.late_ms = 2 * tick_ms      # a tick this late is an overrun
+        self.enabled = enabled
+        self.log = log
+        self.degrade_pct = degrade_pct
+        self.recover_pct = recover_pct
+        self.hold_ticks = hold_ticks
+        self._recent: deque[bool] = deque(maxlen=window)
+        self._last = 0.0
+        self._held = 0
+        self.stage = LoadMonitor.FULL
+        # counters
+        self.ticks = 0
+        self.overruns = 0
+        self.degrades = 0
+        self.recovers = 0
+
+    @property
+    def shed_decor(self) -> bool:
+        """Should decorative work (button animations, progress bar) be skipped?"""
+        return self.stage >= LoadMonitor.SHED_DECOR
+
+    @property
+    def frame_step(self) -> int:
+        """Box animation frame step for the current stage"""
+        return LoadMonitor.FRAME_STEPS[self.stage]
+
+    def pause(self):
+        """Ignore the next tick interval (call after handling a non-TIMEOUT event)"""
+        self._last = 0.0
+
+    def tick(self) -> int:
+        """Call on each TIMEOUT event; returns the (possibly changed) stage"""
+        if not self.enabled:
+            return self.stage
+
+        now = time.perf_counter()
+        last, self._last = self._last, now
+        if not last:
+            return self.stage       # (re-)establish our baseline
+
+        self.ticks += 1
+        late = (now - last) * 1000 > self.late_ms
+        self.overruns += late
+        self._recent.append(late)
+        self._held += 1
+        if self._held < self.hold_ticks or len(self._recent) < self._recent.maxlen:
+            return self.stage
+
+        late_pct = 100 * sum(self._recent) / len(self._recent)
+        if late_pct >= self.degrade_pct and self.stage < LoadMonitor.SKIP_THIRD:
+            self.degrades += 1
+            self._change(self.stage + 1, late_pct)
+        elif late_pct <= self.recover_pct and self.stage > LoadMonitor.FULL:
+            self.recovers += 1
+            self._change(self.stage - 1, late_pct)
+        return self.stage
+
+    def _change(self, stage: int, late_pct: float):
+        self.stage = stage
+        self._held = 0
+        self.log(f'Load: {late_pct:.0f}% late ticks -> {LoadMonitor.STAGE_NAMES[stage]} '
+                 f'(ticks={self.ticks} overruns={self.overruns} '
+                 f'degrades={self.degrades} recovers={self.recovers})')
+
+    def report(self):
+        """Log the counters (e.g. on exit)"""
+        if self.enabled and self.ticks:
+            self.log(f'Load: {self.overruns}/{self.ticks} ticks overran '
+                     f'({100 * self.overruns / self.ticks:.1f}%), '
+                     f'degrades={self.degrades} recovers={self.recovers}, '
+                     f'final stage: {LoadMonitor.STAGE_NAMES[self.stage]}')
+
+
+if __name__ == '__main__':
+    # For testing only: drive the monitor with a fake clock
+    def test():
+        clock = 0.0
+        time.perf_counter = lambda: clock       # (this module is the only user here)
+        messages = []
+        monitor = LoadMonitor(tick_ms=10, log=messages.append, window=20, hold_ticks=20)
+
+        def ticks(count: int, interval_ms: int) -> list[int]:
+            nonlocal clock
+            stages = []
+            for _ in range(count):
+                clock += interval_ms / 1000
+                stages.append(monitor.tick())
+            return stages
+
+        assert set(ticks(60, 10)) == {LoadMonitor.FULL}, 'on time: stays at full quality'
+
+        stages = ticks(100, 40)         # every tick late: degrade one stage at a time...
+        changes = [idx for idx in range(1, len(stages)) if stages[idx] != stages[idx - 1]]
+        assert stages[-1] == LoadMonitor.SKIP_THIRD and monitor.degrades == 3
+        assert all(b - a >= monitor.hold_ticks for a, b in zip(changes, changes[1:])), '...holding each'
+        assert monitor.frame_step == 3 and monitor.shed_decor
+
+        stages = ticks(200, 10)         # load gone: recover one stage at a time
+        assert stages[-1] == LoadMonitor.FULL and monitor.recovers == 3
+        assert sorted(stages, reverse=True) == stages, 'recovery only steps up in quality'
+        assert monitor.frame_step == 1 and not monitor.shed_decor
+
+        monitor.pause()                 # a long gap after another event is not an overrun
+        overruns = monitor.overruns
+        ticks(1, 500)
+        assert monitor.overruns == overruns
+
+        assert monitor.ticks == 359 and monitor.overruns == 100, (monitor.ticks, monitor.overruns)
+        assert len(messages) == 6
+        monitor.report()
+        print('\n'.join(messages))
+
+    test()
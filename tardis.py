@@ -9,6 +9,8 @@ import base64
 import PySimpleGUI as sg
 from tardis_controller import TardisController, IDLE_TITLE, MAX_VOL, INIT_VOL
 from animated_image import AnimatedImage
+from load_monitor import LoadMonitor
+from frame_decoder import FrameDecoder
 # from timed_print import elapsed_print as eprint   # pick one
 eprint = print                                      # or the other
 
@@ -96,9 +98,11 @@ def make_layout(names: list[str]) -> list[list]:
     return [[pics, controls]]
 
 
-def main():
-    """Main program with event loop"""
-    tc = TardisController(AUDIO, IMAGES)
+def main(adaptive=False):
+    """Main program with event loop (adaptive: degrade animations when the CPU is loaded)"""
+    decoder = FrameDecoder()
+    decoder.prefetch(NEXT_BTN, PREV_BTN, EXIT_BTN)     # decode all our buttons in parallel
+    tc = TardisController(AUDIO, IMAGES, decoder)
     # init our window
     the_font = TRY_FONTS[0]             # don't use pick_a_font()
     layout = make_layout(tc.titles)
@@ -109,21 +113,33 @@ def main():
     progress = 0
     tc.init_window(window, BEACON_KEY, BOX_KEY, PBD_KEY)
     # Demo our fancy animated buttons
-    ani_next = AnimatedImage(window[NEXT_KEY], NEXT_BTN)
-    ani_prev = AnimatedImage(window[PREV_KEY], PREV_BTN)
+    ani_next = AnimatedImage(window[NEXT_KEY], NEXT_BTN, decoder=decoder)
+    ani_prev = AnimatedImage(window[PREV_KEY], PREV_BTN, decoder=decoder)
+    ani_exit = AnimatedImage(window[EXIT_KEY], EXIT_BTN, decoder=decoder)     # ready for the big finish
+    monitor = LoadMonitor(tick_ms=10, enabled=adaptive, log=eprint)
+    stage = monitor.stage
 
     is_playing = False          # may lead/lag actual player status
     is_demo_mode = False
 
     while True:
         event, values = window.read(10)     # short t/o for smoother animations, but not too short!
+        if event != TIMEOUT_KEY:
+            monitor.pause()                 # other events legitimately delay the next tick
 
         if event == TIMEOUT_KEY:        # check the most frequent event first
+            if monitor.tick() != stage:     # falling behind (or caught up)?
+                stage = monitor.stage
+                tc.set_frame_step(monitor.frame_step)
+                if monitor.shed_decor:
+                    ani_next.stop()
+                    ani_prev.stop()
+
             if is_playing:                  # it was playing...
                 tc.run_effects()            # yes: continue animations
-                # update progress only if needed
+                # update progress only if needed (and we can afford it)
                 curr_prog = tc.progress
-                if curr_prog - progress >= 2:   # only bump for "significant" progress
+                if curr_prog - progress >= 2 and not monitor.shed_decor:
                     progress = curr_prog
                     prog_bar.update(current_count=progress)
 
@@ -167,12 +183,14 @@ def main():
             window.write_event_value(PLAY_KEY, None)        # queue PLAY button
         elif event == PREV_KEY:
             tc.select_prev()
-            ani_prev.start()
+            if not monitor.shed_decor:
+                ani_prev.start()
             is_playing = False
             window.write_event_value(PLAY_KEY, None)        # queue PLAY button
         elif event == NEXT_KEY:
             tc.select_next()
-            ani_next.start()
+            if not monitor.shed_decor:
+                ani_next.start()
             is_playing = False
             window.write_event_value(PLAY_KEY, None)        # queue PLAY button
 
@@ -188,12 +206,13 @@ def main():
         else:
             eprint(f'Unexpected event: {event} value: {values.get(event)}')
     # end event loop
+    monitor.report()
 
     if event == EXIT_KEY:       # only if leaving via EXIT button
         # But wait! We've got a big finish! (flash animated buttons & alter Tardis image)
         ani_next.start()
         ani_prev.start()
-        ani_exit = AnimatedImage(window[EXIT_KEY], EXIT_BTN).start()
+        ani_exit.start()
         window.set_title(tc.on_close())
         while window.read(10)[0] == TIMEOUT_KEY:
             # These animations all have loop==1, so this doesn't last long
@@ -204,6 +223,7 @@ def main():
             ani_exit.run()
 
     window.close()
+    decoder.shutdown()
     # print("Time's up!")
 
 
@@ -217,4 +237,4 @@ if __name__ == '__main__':
         print(f'  VLC  {vlc_version}')
         exit()
 
-    main()
+    main(adaptive='-a' in sys.argv)
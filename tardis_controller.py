@@ -9,6 +9,7 @@ import PySimpleGUI as sg
 from tracks import TRACKS, CLOSE_EFFECT
 from audio_player import AudioPlayer
 from video_player import VideoPlayer
+from frame_decoder import FrameDecoder
 
 IDLE_TITLE = '..idle..'
 MAX_VOL = AudioPlayer.MAX_VOL
@@ -17,16 +18,19 @@ INIT_VOL = AudioPlayer.INIT_VOL
 
 class TardisController:
     """TARDIS audio/visual controller"""
-    def __init__(self, audio_path, images_path):
+    def __init__(self, audio_path, images_path, decoder: FrameDecoder = None):
         self._trk_idx = 0
         self._audio = AudioPlayer(audio_path)
-        self._video = VideoPlayer(images_path)
+        self._video = VideoPlayer(images_path, decoder)
         self.duration = 0       # cache track duration value
 
     def init_window(self, window: sg.Window, beacon_key: str, box_key: str, pbd_key: str):
         """Do animation initialization after window widgets are defined"""
         self._video.init(window[beacon_key], window[box_key])
         self._audio.init_pbd(window, pbd_key)
+        # warm up: the first track's animations and our big finish
+        self._video.prefetch(TRACKS[self._trk_idx].effect)
+        self._video.prefetch(CLOSE_EFFECT.effect, pinned=True)
 
     @property
     def titles(self) -> list[str]:
@@ -50,6 +54,8 @@ class TardisController:
         self.duration = self._audio.play(ti.track)
         if self.duration:
             self._video.start(ti.effect)
+            # the next track is the likeliest to follow (PREV, NEXT, demo mode)
+            self._video.prefetch(TRACKS[(self._trk_idx + 1) % len(TRACKS)].effect)
             dur_secs = self.duration / 1000
             return f'{TRACKS[self._trk_idx].title} ({dur_secs:.1f})'
         else:
@@ -80,6 +86,9 @@ class TardisController:
     def set_volume(self, vol: int):
         self._audio.set_volume(vol)
 
+    def set_frame_step(self, step: int):
+        self._video.set_frame_step(step)
+
     def run_effects(self):
         self._video.run()
 
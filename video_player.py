@@ -8,6 +8,7 @@ from pathlib import Path
 from enum import Enum
 import PySimpleGUI as sg
 from animated_image import AnimatedImage
+from frame_decoder import FrameDecoder
 
 
 class BeaconSpeed(Enum):
@@ -35,16 +36,37 @@ effects = {
 
 class VideoPlayer:
     """Handle GUI Image animations"""
-    def __init__(self, images_folder: Path):
-        """Init with the location of our animations."""
+    def __init__(self, images_folder: Path, decoder: FrameDecoder = None):
+        """Init with the location of our animations (and optionally, who decodes them)."""
         self._folder = images_folder
+        self._decoder = decoder
+        self._prefetched: list[Path] = []       # our latest guess at what's next
         self._beacon_ani: AnimatedImage | None = None
         self._box_ani: AnimatedImage | None = None
 
     def init(self, beacon: sg.Image, box: sg.Image):
         """Image initialization must be deferred until window widgets are defined"""
-        self._beacon_ani = AnimatedImage(beacon)
-        self._box_ani = AnimatedImage(box)
+        self._beacon_ani = AnimatedImage(beacon, decoder=self._decoder)
+        self._box_ani = AnimatedImage(box, decoder=self._decoder)
+
+    def prefetch(self, effect_name: str, pinned=False):
+        """
+        Start decoding an effect's animations before they are needed
+        :param pinned: keep them ready until exit, else they replace our previous guess
+        """
+        if not self._decoder:
+            return
+        box_file, beacon_speed = effects.get(effect_name, (None, None))
+        files = []
+        if beacon_speed and beacon_speed.value != self._beacon_ani.name:
+            files.append(self._folder / (beacon_speed.value + '.png'))
+        if box_file and box_file != self._box_ani.name:
+            files.append(self._folder / (box_file + '.png'))
+
+        if not pinned:      # don't let stale guesses tie up shared memory
+            self._decoder.discard(*(fn for fn in self._prefetched if fn not in files))
+            self._prefetched = files
+        self._decoder.prefetch(*files, pinned=pinned)
 
     def start(self, effect_name: str):
         """Load and display first image of animation."""
@@ -58,6 +80,10 @@ class VideoPlayer:
             file_path = self._folder / (box_file + '.png')
             self._box_ani.load(file_path).start()
 
+    def set_frame_step(self, step: int):
+        """Skip box animation frames when under load (the beacon is never degraded)"""
+        self._box_ani.frame_step = step
+
     def run(self):
         """Step our aminations along"""
         self._beacon_ani.run()